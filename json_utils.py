@@ -0,0 +1,27 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so this catches both.
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse JSON from a str or bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    """Serialize to a JSON string, using orjson when it is installed."""
+    if orjson is not None:
+        option = (orjson.OPT_INDENT_2 if indent else 0) | (
+            orjson.OPT_SORT_KEYS if sort_keys else 0
+        )
+        return orjson.dumps(obj, option=option).decode()
+    return json.dumps(obj, indent=2 if indent else None, sort_keys=sort_keys)
@@ -1,35 +1,203 @@
-import json
+import sys
 import asyncio
+import argparse
+import builtins
+import hashlib
+import logging
+import threading
+from functools import partial
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import AsyncExitStack
 from dotenv import load_dotenv
 import aisuite as ai
-import nest_asyncio
+import json_utils
 from mcp_client_manager import MCPClientManager
 
-nest_asyncio.apply()
+try:
+    from aisuite.provider import ProviderFactory
+except ImportError:  # layout of a newer aisuite; _complete falls back to create()
+    ProviderFactory = None
+
 load_dotenv()
 
+logger = logging.getLogger("mcp_chatbot")
+
+# Upper bound on extract_info calls in flight at once in forced tool mode
+MAX_CONCURRENT_EXTRACTS = 8
+
+# Number of final (tool-free) LLM answers kept for exact-match reuse
+RESPONSE_CACHE_SIZE = 256
+
+# Seconds one process_query turn (LLM call plus its tool calls) may take
+TURN_DEADLINE_S = 120
+
+# HTTP timeout of each blocking LLM request; a --lazy-tools turn makes two of
+# them, which still fit within TURN_DEADLINE_S
+LLM_REQUEST_TIMEOUT_S = 30
+
+# Seconds all extract_info calls of a forced-tool query may take together
+EXTRACT_DEADLINE_S = 30
+
+# Only notebooks re-enter a running loop; nest_asyncio slows every callback elsewhere.
+# get_ipython is a builtin only inside an IPython shell, unlike a mere IPython import.
+if hasattr(builtins, "get_ipython"):
+    import nest_asyncio
+
+    nest_asyncio.apply()
+
+
+def _extract_text(result) -> str:
+    """Return the text of a tool result; servers here reply with one text item."""
+    content = result.content
+    return content[0].text if type(content) is list and content else str(content)
+
+
+def _read_line(prompt: str) -> str:
+    """input(), but reading piped stdin without going through its buffer lock.
+
+    A daemon thread parked inside sys.stdin's buffered reader makes interpreter
+    shutdown abort, so non-terminal input is read from the unbuffered file.
+    """
+    if sys.stdin.isatty():
+        return input(prompt)
+    print(prompt, end="", flush=True)
+    data = sys.stdin.buffer.raw.readline()
+    if not data:
+        raise EOFError
+    return data.decode(sys.stdin.encoding, errors="replace").rstrip("\r\n")
+
+
+def _settle(future: asyncio.Future, line: str, error: BaseException | None):
+    """Resolve an input future unless it was already cancelled."""
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(line)
+
+
+async def _ainput(prompt: str) -> str:
+    """Read a line from stdin without blocking the event loop.
+
+    The read runs on a daemon thread rather than the default executor: a thread
+    stuck in input() would otherwise hold up interpreter exit after Ctrl+C.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def read():
+        line, error = "", None
+        try:
+            line = _read_line(prompt)
+        except BaseException as e:
+            error = e
+        try:
+            loop.call_soon_threadsafe(_settle, future, line, error)
+        except RuntimeError:  # the loop closed while we were waiting
+            pass
+
+    threading.Thread(target=read, name="mcp-input", daemon=True).start()
+    return await future
+
+
+def _tool_reply(result) -> str:
+    """Text for a tool message: the result's text, or the error the call produced."""
+    if isinstance(result, BaseException):
+        return f"Error calling tool: {result}"
+    try:
+        return _extract_text(result)
+    except Exception as e:
+        return f"Error calling tool: {e}"
+
 
 class MCP_ChatBot:
-    def __init__(self):
+    def __init__(self, batch_summaries: bool = False, lazy_tools: bool = False):
         self.mcp_manager = MCPClientManager()
-        self.client = ai.Client()
         self.model = "huggingface:Qwen/Qwen3-8B"
+        # Cancelling a timed-out turn cannot stop its executor thread, so each
+        # request carries its own HTTP timeout and the thread is freed with it
+        self.client = ai.Client(
+            provider_configs={
+                self.model.split(":", 1)[0]: {"timeout": LLM_REQUEST_TIMEOUT_S}
+            }
+        )
+        # When batching, forced-tool summaries are queued and answered in one LLM call
+        self.batch_summaries = batch_summaries
+        self._pending_summaries: list[tuple[str, str]] = []
+        # When lazy, the model first picks from compact tool summaries and only the
+        # chosen tools are resent with their full schemas
+        self.lazy_tools = lazy_tools
+        # LRU of hash(model, messages, tool names) -> final assistant message
+        self._resp_cache: OrderedDict[bytes, object] = OrderedDict()
+        self.use_forced_tools = False
+        # Cleared if aisuite's internals differ from the pinned version (see _complete)
+        self._direct_provider = True
+
+        # Query dispatch: first character, then the command token for "/" commands
+        self._prefix_handlers = {"@": self._handle_at, "/": self._handle_slash}
+        self._slash_commands = {
+            "/prompts": self._cmd_prompts,
+            "/prompt": self._cmd_prompt,
+            "/flush": self._cmd_flush,
+        }
+        # '@' names that are fixed resources rather than papers://<arg> lookups
+        self._at_resources = {"folders": "papers://folders"}
 
     async def _call_mcp_tool(self, tool_name: str, tool_args: dict) -> str:
         """Helper to call MCP tool and format result."""
         try:
             result = await self.mcp_manager.call_tool(tool_name, tool_args)
-            return (
-                result.content[0].text
-                if isinstance(result.content, list)
-                else str(result.content)
-            )
         except Exception as e:
-            return f"Error calling tool: {e}"
+            result = e
+        return _tool_reply(result)
+
+    def _complete(self, messages: list, tools) -> object:
+        """Blocking chat completion that actually sends ``tools`` to the model.
+
+        aisuite 0.1.14's ``completions.create`` pops ``tools`` and only uses them
+        for its own ``max_turns`` runner, which wants Python callables it executes
+        itself. So the provider is called directly; it forwards extra keyword
+        arguments to the inference API. If aisuite's internals no longer match,
+        this degrades to ``create``, which answers without tools.
+        """
+        completions = self.client.chat.completions
+        provider = self._tool_provider()
+        if provider is None:
+            return completions.create(model=self.model, messages=messages, tools=tools)
+        response = provider.chat_completions_create(
+            self.model.split(":", 1)[1], messages, tools=list(tools)
+        )
+        # create() would strip the model's <think> block; keep that behaviour
+        strip_thinking = getattr(completions, "_extract_thinking_content", None)
+        return response if strip_thinking is None else strip_thinking(response)
+
+    def _tool_provider(self):
+        """Return the aisuite provider for the model, or None if it is unreachable."""
+        if self._direct_provider and ProviderFactory is not None:
+            provider_key = self.model.split(":", 1)[0]
+            try:
+                providers = self.client.providers
+                provider = providers.get(provider_key)
+                if provider is None:
+                    provider = ProviderFactory.create_provider(
+                        provider_key, self.client.provider_configs.get(provider_key, {})
+                    )
+                    providers[provider_key] = provider
+                return provider
+            except AttributeError:
+                pass
+        if self._direct_provider:
+            logger.warning(
+                "Unsupported aisuite version; tools will not be sent to the model"
+            )
+            self._direct_provider = False
+        return None
 
     async def process_query(self, query):
         """Process the query"""
+        loop = asyncio.get_running_loop()
         system_prompt = """You are an expert research assistant capable of using tools at your exposure and return
         relevent information given a query.
         Use the relevent available tools to answer the user query"""
@@ -38,51 +206,133 @@ class MCP_ChatBot:
             {"role": "user", "content": query},
         ]
 
+        # Bind what every turn reuses so the loop body works on locals
+        complete = self._complete
+        model = self.model
+        manager = self.mcp_manager
+        lazy_tools = self.lazy_tools
+        tools = manager.tool_summaries if lazy_tools else manager.available_tools
+        tool_names = [tool["function"]["name"] for tool in manager.available_tools]
+        resp_cache = self._resp_cache
+
         process_query = True
         while process_query:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                tools=self.mcp_manager.available_tools,
-            )
-
-            message = response.choices[0].message
-            print(f"Role: {message.role}")
-
-            if message.content:
-                print(message.content)
-                messages.append({"role": message.role, "content": message.content})
-
-            if not message.tool_calls:
-                process_query = False
-            else:
-                messages.append(message)
-
-                for tool_call in message.tool_calls:
-                    tool_name = tool_call.function.name
-                    tool_args = json.loads(tool_call.function.arguments)
-                    tool_call_id = tool_call.id
-
-                    print(f"Calling tool {tool_name} with args {tool_args}")
-                    result_text = await self._call_mcp_tool(tool_name, tool_args)
-
+            # One deadline bounds the whole turn: LLM call(s) plus tool dispatch
+            async with asyncio.timeout(TURN_DEADLINE_S):
+                cache_key = hashlib.blake2b(
+                    json_utils.dumps(
+                        [model, messages, tool_names], sort_keys=True
+                    ).encode()
+                ).digest()
+                message = resp_cache.get(cache_key)
+                if message is not None:
+                    resp_cache.move_to_end(cache_key)
+                    logger.debug("Reusing cached response")
+                else:
+                    # aisuite's client is blocking; run it off the loop so MCP I/O
+                    # keeps flowing
+                    response = await loop.run_in_executor(
+                        None,
+                        partial(complete, messages, tools),
+                    )
+                    message = response.choices[0].message
+
+                    # Phase 2: resend only the chosen tools, now with full schemas
+                    if lazy_tools and message.tool_calls:
+                        selected = manager.get_tool_definitions(
+                            tc.function.name for tc in message.tool_calls
+                        )
+                        if selected:
+                            response = await loop.run_in_executor(
+                                None,
+                                partial(complete, messages, selected),
+                            )
+                            message = response.choices[0].message
+
+                    # Only final answers are cached; tool-calling turns must still
+                    # run tools
+                    if not message.tool_calls:
+                        resp_cache[cache_key] = message
+                        if len(resp_cache) > RESPONSE_CACHE_SIZE:
+                            resp_cache.popitem(last=False)
+
+                logger.debug("Role: %s", message.role)
+
+                if message.content:
+                    print(message.content)
+                    messages.append({"role": message.role, "content": message.content})
+
+                if not message.tool_calls:
+                    process_query = False
+                else:
+                    # Store a plain dict so the provider never re-normalizes the SDK
+                    # object
                     messages.append(
                         {
-                            "role": "tool",
-                            "tool_call_id": tool_call_id,
-                            "content": result_text,
+                            "role": message.role,
+                            "content": message.content or "",
+                            "tool_calls": [
+                                {
+                                    "id": tc.id,
+                                    "type": "function",
+                                    "function": {
+                                        "name": tc.function.name,
+                                        "arguments": tc.function.arguments,
+                                    },
+                                }
+                                for tc in message.tool_calls
+                            ],
                         }
                     )
 
+                    # Identical calls within one turn share a single dispatch
+                    unique_calls: dict[str, tuple[str, dict]] = {}
+                    calls = []
+                    for tool_call in message.tool_calls:
+                        fn = tool_call.function
+                        tool_name = fn.name
+                        tool_args = json_utils.loads(fn.arguments)
+                        key = json_utils.dumps(
+                            {"n": tool_name, "a": tool_args}, sort_keys=True
+                        )
+                        if key not in unique_calls:
+                            logger.debug(
+                                "Calling tool %s with args %s", tool_name, tool_args
+                            )
+                            unique_calls[key] = (tool_name, tool_args)
+                        calls.append((tool_call.id, key))
+
+                    # Dispatch the distinct calls at once (batched per server where
+                    # supported), then answer in emitted order
+                    call_results = await manager.call_tools_batch(
+                        list(unique_calls.values())
+                    )
+                    results = {
+                        key: _tool_reply(result)
+                        for key, result in zip(unique_calls, call_results)
+                    }
+                    # One extend grows the history once for the whole burst
+                    messages.extend(
+                        [
+                            {
+                                "role": "tool",
+                                "tool_call_id": tool_call_id,
+                                "content": results[key],
+                            }
+                            for tool_call_id, key in calls
+                        ]
+                    )
+
     async def process_query_with_forced_tools(self, topic, num_papers=5):
         """
         Process a query by forcing the model to use tools in a specific sequence.
         First calls search_papers, then extract_info for each paper found.
         """
-        print(f"\n🔍 Processing query with forced tool calls: {topic}")
+        loop = asyncio.get_running_loop()
+        logger.info("\n🔍 Processing query with forced tool calls: %s", topic)
 
         # Step 1: Force search_papers tool call
-        print("\n📚 Step 1: Searching for papers...")
+        logger.info("\n📚 Step 1: Searching for papers...")
 
         try:
             search_result = await self.mcp_manager.call_tool(
@@ -96,38 +346,79 @@ class MCP_ChatBot:
         if not paper_ids:
             print("No papers found.")
             return
-        print(f"Found papers: {paper_ids}")
+        logger.info("Found papers: %s", paper_ids)
 
         # Step 2: Force extract_info for each paper
-        print("\n📄 Step 2: Extracting information for each paper...")
+        logger.info("\n📄 Step 2: Extracting information for each paper...")
         papers_info = []
-        for paper_id in paper_ids:
-            print(f"\n  Extracting info for paper: {paper_id}")
-            try:
-                extract_result = await self.mcp_manager.call_tool(
+        # Papers are independent, so dispatch the extract_info calls concurrently,
+        # capped so a large num_papers cannot flood the server
+        limit = asyncio.Semaphore(MAX_CONCURRENT_EXTRACTS)
+
+        async def extract(paper_id):
+            async with limit:
+                return await self.mcp_manager.call_tool(
                     "extract_info", arguments={"paper_id": paper_id}
                 )
-                paper_info_json = (
-                    extract_result.content[0].text
-                    if isinstance(extract_result.content, list)
-                    else str(extract_result.content)
-                )
-                papers_info.append(json.loads(paper_info_json))
+
+        # One deadline for the whole fan-out; papers that finish in time are kept
+        tasks = [asyncio.ensure_future(extract(paper_id)) for paper_id in paper_ids]
+        try:
+            _, pending = await asyncio.wait(tasks, timeout=EXTRACT_DEADLINE_S)
+        finally:
+            # Stops the stragglers, or every call if this query is being cancelled
+            for task in tasks:
+                task.cancel()
+        if pending:
+            logger.warning(
+                "%d of %d extract(s) did not finish within %ss; summarizing the rest",
+                len(pending),
+                len(tasks),
+                EXTRACT_DEADLINE_S,
+            )
+
+        for paper_id, task in zip(paper_ids, tasks):
+            if task in pending:
+                continue
+            # A failed call is logged from its task, never re-raised
+            if task.cancelled():
+                logger.warning("Extracting info for %s was cancelled", paper_id)
+                continue
+            if (error := task.exception()) is not None:
+                logger.warning("Error extracting info for %s: %s", paper_id, error)
+                continue
+            try:
+                papers_info.append(json_utils.loads(_extract_text(task.result())))
             except Exception as e:
-                print(f"Error extracting info for {paper_id}: {e}")
+                logger.warning("Error extracting info for %s: %s", paper_id, e)
+            else:
+                logger.debug("Extracted info for paper: %s", paper_id)
 
         # Step 3: Ask the model to summarize the results
-        print("\n🤖 Step 3: Asking model to summarize the findings...")
+        logger.info("\n🤖 Step 3: Asking model to summarize the findings...")
         summary_prompt = f"""Based on the following research papers about '{topic}', please provide a brief summary:
 
 Papers found:
-{json.dumps(papers_info, indent=2)}
+{json_utils.dumps(papers_info, indent=True)}
 
 Please summarize the key findings and relevance of these papers."""
 
+        if self.batch_summaries:
+            self._pending_summaries.append((topic, summary_prompt))
+            print(
+                f"Queued summary for '{topic}' ({len(self._pending_summaries)} pending)."
+                " Send an empty query or /flush to summarize."
+            )
+            return papers_info
+
         messages = [{"role": "user", "content": summary_prompt}]
-        response = self.client.chat.completions.create(
-            model=self.model, messages=messages
+        response = await loop.run_in_executor(
+            None,
+            partial(
+                self.client.chat.completions.create,
+                model=self.model,
+                messages=messages,
+            ),
         )
 
         message = response.choices[0].message
@@ -136,6 +427,39 @@ Please summarize the key findings and relevance of these papers."""
 
         return papers_info
 
+    async def flush_summaries(self):
+        """Answer all queued summary prompts with a single LLM call."""
+        if not self._pending_summaries:
+            print("No pending summaries.")
+            return
+
+        loop = asyncio.get_running_loop()
+        pending, self._pending_summaries = self._pending_summaries, []
+        print(f"\n🤖 Summarizing {len(pending)} queued topic(s) in one request...")
+
+        sections = "\n\n".join(
+            f"=== Request {i}: {topic} ===\n{prompt}"
+            for i, (topic, prompt) in enumerate(pending, start=1)
+        )
+        batch_prompt = f"""Answer each of the following {len(pending)} requests in turn.
+Start each answer with a heading of the form '## Request <number>: <topic>'.
+
+{sections}"""
+
+        messages = [{"role": "user", "content": batch_prompt}]
+        response = await loop.run_in_executor(
+            None,
+            partial(
+                self.client.chat.completions.create,
+                model=self.model,
+                messages=messages,
+            ),
+        )
+
+        message = response.choices[0].message
+        if message.content:
+            print(f"\n📝 Summaries:\n{message.content}")
+
     async def chat_loop(self):
         """Run an interactive chat loop"""
         print("\nMCP Chatbot Started!")
@@ -143,126 +467,128 @@ Please summarize the key findings and relevance of these papers."""
         print("  1. Optional tool calling (model decides)")
         print("  2. Forced tool calling (always uses search_papers + extract_info)")
 
-        mode = input("\nSelect mode (1 or 2): ").strip()
-        use_forced_tools = mode == "2"
+        # input() blocks, so it is read off the loop to keep MCP transports serviced
+        mode = (await _ainput("\nSelect mode (1 or 2): ")).strip()
+        self.use_forced_tools = mode == "2"
 
         print(
-            f"\n{'🔧 Forced tool mode' if use_forced_tools else '🤖 Optional tool mode'} activated!"
+            f"\n{'🔧 Forced tool mode' if self.use_forced_tools else '🤖 Optional tool mode'} activated!"
         )
         print("Type your queries or 'quit' to exit.")
 
         while True:
             try:
-                query = input("\nQuery: ").strip()
+                query = (await _ainput("\nQuery: ")).strip()
 
                 if query.lower() == "quit":
+                    if self._pending_summaries:
+                        await self.flush_summaries()
                     break
 
-                if query.startswith("@"):
-                    # Remove @ sign and split
-                    cmd_line = query[1:].strip()
-                    if not cmd_line:
-                        continue
-
-                    parts = cmd_line.split()
-                    cmd_or_tool = parts[0]
-                    args_raw = parts[1:]
-
-                    # Support '@git list_commits ...' style by shifting
-                    if cmd_or_tool == "git" and len(parts) > 1:
-                        cmd_or_tool = parts[1]
-                        args_raw = parts[2:]
-
-                    # 1. Try to find if it's a tool
-                    schema = self.mcp_manager.get_tool_schema(cmd_or_tool)
-                    if schema:
-                        args = {}
-                        properties = schema.get("properties", {})
-                        # Sort properties to have a stable positional mapping if 'required' is not enough
-                        prop_names = list(properties.keys())
-                        required_props = schema.get("required", [])
-
-                        # Use required props order first, then remaining props
-                        mapping_order = required_props + [
-                            p for p in prop_names if p not in required_props
-                        ]
-
-                        for i, arg in enumerate(args_raw):
-                            if "=" in arg:
-                                k, v = arg.split("=", 1)
-                                args[k] = v
-                            elif i < len(mapping_order):
-                                args[mapping_order[i]] = arg
-
-                        print(f"🔧 Executing @{cmd_or_tool} with {args}")
-                        result_text = await self._call_mcp_tool(cmd_or_tool, args)
-                        print(f"\n{result_text}")
-                        continue
-
-                    # 2. Try to handle as a resource (ArXiv papers or templates)
-                    if cmd_or_tool == "folders":
-                        resource_uri = "papers://folders"
-                    else:
-                        resource_uri = f"papers://{cmd_line}"
-
-                    await self.get_resource(resource_uri)
+                # An empty query while summaries are queued means the user is idle
+                if not query and self._pending_summaries:
+                    await self.flush_summaries()
                     continue
-                print("\n")
-                if query.startswith("/"):
-                    parts = query.split()
-                    command = parts[0].lower()
-
-                    if command == "/prompts":
-                        await self.list_prompts()
-                    elif command == "/prompt":
-                        if len(parts) < 2:
-                            print("Usage: /prompt <name> <arg1=value1> <arg2=value2>")
-                            continue
-
-                        prompt_name = parts[1]
-                        args = {}
-
-                        # Parse arguments
-                        for arg in parts[2:]:
-                            if "=" in arg:
-                                key, value = arg.split("=", 1)
-                                args[key] = value
-
-                        await self.execute_prompt(prompt_name, args, use_forced_tools)
-                    else:
-                        print(f"Unknown command: {command}")
-                    continue
-                if use_forced_tools:
-                    await self.process_query_with_forced_tools(query)
-                else:
-                    await self.process_query(query)
 
+                handler = self._prefix_handlers.get(query[:1], self._handle_query)
+                await handler(query)
+
+            except TimeoutError:
+                print(f"\nError: no answer within {TURN_DEADLINE_S}s, try again.")
             except Exception as e:
                 print(f"\nError: {str(e)}")
 
-    async def get_resource(self, resource_uri):
-        """Read an MCP resource."""
-        # Seek server through manager
-        server_name = self.mcp_manager.resource_to_server.get(resource_uri)
-
-        if not server_name:
-            # Try matching template
-            for (
-                template_uri,
-                srv,
-            ) in self.mcp_manager.resource_templates_to_server.items():
-                prefix = template_uri.split("{")[0]
-                if resource_uri.startswith(prefix):
-                    server_name = srv
-                    break
+    async def _handle_at(self, query: str):
+        """Run an '@' shortcut: a tool call or a resource read."""
+        # Remove @ sign and split
+        cmd_line = query[1:].strip()
+        if not cmd_line:
+            return
 
-        if not server_name:
-            print(f"Resource '{resource_uri}' not found.")
+        parts = cmd_line.split()
+        cmd_or_tool = parts[0]
+        args_raw = parts[1:]
+
+        # Support '@git list_commits ...' style by shifting
+        if cmd_or_tool == "git" and len(parts) > 1:
+            cmd_or_tool = parts[1]
+            args_raw = parts[2:]
+
+        # 1. A known tool name runs the tool (the positional order doubles as lookup)
+        mapping_order = self.mcp_manager.tool_arg_order.get(cmd_or_tool)
+        if mapping_order is not None:
+            await self._at_tool(cmd_or_tool, mapping_order, args_raw)
             return
 
-        session = self.mcp_manager.sessions.get(server_name)
+        # 2. Otherwise read it as a resource (ArXiv papers or templates)
+        resource_uri = self._at_resources.get(cmd_or_tool)
+        await self.get_resource(resource_uri or f"papers://{cmd_line}")
+
+    async def _at_tool(self, tool_name: str, mapping_order: list[str], args_raw):
+        """Call a tool from '@' arguments: key=value pairs or positional values."""
+        args = {}
+        for i, arg in enumerate(args_raw):
+            if "=" in arg:
+                k, v = arg.split("=", 1)
+                args[k] = v
+            elif i < len(mapping_order):
+                args[mapping_order[i]] = arg
+
+        print(f"🔧 Executing @{tool_name} with {args}")
+        result_text = await self._call_mcp_tool(tool_name, args)
+        print(f"\n{result_text}")
+
+    async def _handle_slash(self, query: str):
+        """Run a '/' command through the command table."""
+        print("\n")
+        parts = query.split()
+        command = parts[0].lower()
+
+        handler = self._slash_commands.get(command)
+        if handler is None:
+            print(f"Unknown command: {command}")
+            return
+        await handler(parts)
+
+    async def _handle_query(self, query: str):
+        """Answer a plain query in the selected tool mode."""
+        print("\n")
+        if self.use_forced_tools:
+            await self.process_query_with_forced_tools(query)
+        else:
+            await self.process_query(query)
+
+    async def _cmd_prompts(self, parts: list[str]):
+        """/prompts: list available prompts."""
+        await self.list_prompts()
+
+    async def _cmd_flush(self, parts: list[str]):
+        """/flush: summarize queued topics."""
+        await self.flush_summaries()
+
+    async def _cmd_prompt(self, parts: list[str]):
+        """/prompt <name> <key=value>...: execute a prompt."""
+        if len(parts) < 2:
+            print("Usage: /prompt <name> <arg1=value1> <arg2=value2>")
+            return
+
+        prompt_name = parts[1]
+        args = {}
+
+        # Parse arguments
+        for arg in parts[2:]:
+            if "=" in arg:
+                key, value = arg.split("=", 1)
+                args[key] = value
+
+        await self.execute_prompt(prompt_name, args, self.use_forced_tools)
+
+    async def get_resource(self, resource_uri):
+        """Read an MCP resource."""
+        # Seek session through manager (exact URI first, then templates)
+        session = self.mcp_manager.get_resource_session(resource_uri)
         if not session:
-            print(f"No session for server '{server_name}'")
+            print(f"Resource '{resource_uri}' not found.")
             return
 
         try:
@@ -289,13 +615,14 @@ Please summarize the key findings and relevance of these papers."""
             if prompt["arguments"]:
                 print("  Arguments:")
                 for arg in prompt["arguments"]:
-                    arg_name = arg.name if hasattr(arg, "name") else arg.get("name", "")
+                    arg_name = getattr(arg, "name", None)
+                    if arg_name is None:
+                        arg_name = arg.get("name", "")
                     print(f"    - {arg_name}")
 
     async def execute_prompt(self, prompt_name, args, use_forced_tools):
         """Execute a prompt."""
-        server_name = self.mcp_manager.prompt_to_server.get(prompt_name)
-        session = self.mcp_manager.sessions.get(server_name)
+        session = self.mcp_manager.prompt_to_session.get(prompt_name)
         if not session:
             print(f"Prompt '{prompt_name}' not found.")
             return
@@ -304,16 +631,18 @@ Please summarize the key findings and relevance of these papers."""
             result = await session.get_prompt(prompt_name, arguments=args)
             if result and result.messages:
                 prompt_content = result.messages[0].content
-                text = ""
-                if isinstance(prompt_content, str):
-                    text = prompt_content
-                elif hasattr(prompt_content, "text"):
-                    text = prompt_content.text
-                else:
-                    text = " ".join(
-                        item.text if hasattr(item, "text") else str(item)
-                        for item in prompt_content
-                    )
+                # Single getattr per object instead of hasattr followed by attribute access
+                text = getattr(prompt_content, "text", None)
+                if text is None:
+                    if isinstance(prompt_content, str):
+                        text = prompt_content
+                    else:
+                        text = " ".join(
+                            str(item)
+                            if (part := getattr(item, "text", None)) is None
+                            else part
+                            for item in prompt_content
+                        )
 
                 print(f"\nExecuting prompt '{prompt_name}'...")
                 if use_forced_tools:
@@ -322,42 +651,97 @@ Please summarize the key findings and relevance of these papers."""
                     )
                 else:
                     await self.process_query(text)
+        except TimeoutError:
+            print(f"Error executing prompt: no answer within {TURN_DEADLINE_S}s.")
         except Exception as e:
             print(f"Error executing prompt: {e}")
 
     async def connect_to_servers_and_run(self):
         """Initialize MCP connections and start chatbot."""
+        loop = asyncio.get_running_loop()
+        # Threads only serve the blocking LLM calls; a few are plenty,
+        # versus asyncio's default of up to 32
+        loop.set_default_executor(
+            ThreadPoolExecutor(max_workers=4, thread_name_prefix="mcp")
+        )
+
+        # Eager tasks run synchronously until their first real suspension, so
+        # tool calls and listings that complete immediately skip a loop iteration
+        if hasattr(asyncio, "eager_task_factory"):
+            loop.set_task_factory(asyncio.eager_task_factory)
+
         async with AsyncExitStack() as stack:
             await self.mcp_manager.connect_all(stack)
 
             # Group capabilities for display
-            print("\n📋 Capabilities by server:")
-            for s_name, srv_session in self.mcp_manager.sessions.items():
-                print(f"\n  🔹 {s_name}:")
-                # Tools
-                s_tools = [
-                    t_name
-                    for t_name, srv in self.mcp_manager.tool_to_server.items()
-                    if srv == s_name
-                ]
-                if s_tools:
-                    print(f"    Tools: {s_tools}")
-                # Resources
-                s_resources = [
-                    uri
-                    for uri, srv in self.mcp_manager.resource_to_server.items()
-                    if srv == s_name
-                ]
-                if s_resources:
-                    print(f"    Resources: {s_resources}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("\n📋 Capabilities by server:")
+                by_server = self.mcp_manager.capabilities_by_server
+                for s_name in self.mcp_manager.sessions:
+                    logger.info("\n  🔹 %s:", s_name)
+                    capabilities = by_server[s_name]
+                    # Tools
+                    if capabilities["tools"]:
+                        logger.info("    Tools: %s", capabilities["tools"])
+                    # Resources
+                    if capabilities["resources"]:
+                        logger.info("    Resources: %s", capabilities["resources"])
 
             await self.chat_loop()
 
 
 async def main():
-    chatbot = MCP_ChatBot()
+    parser = argparse.ArgumentParser(description="MCP research chatbot")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="queue forced-tool summaries and answer them in one LLM call",
+    )
+    parser.add_argument(
+        "--lazy-tools",
+        action="store_true",
+        help="send compact tool summaries and full schemas only for chosen tools",
+    )
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="also log per-call details such as tool names and arguments",
+    )
+    verbosity.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="hide progress messages and show only answers and warnings",
+    )
+    cli_args = parser.parse_args()
+
+    # Our progress messages at INFO; third-party libraries (httpx, mcp) stay at WARNING
+    if cli_args.verbose:
+        level = logging.DEBUG
+    elif cli_args.quiet:
+        level = logging.WARNING
+    else:
+        level = logging.INFO
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    for name in ("mcp_chatbot", "mcp_client_manager"):
+        logging.getLogger(name).setLevel(level)
+
+    chatbot = MCP_ChatBot(
+        batch_summaries=cli_args.batch, lazy_tools=cli_args.lazy_tools
+    )
     await chatbot.connect_to_servers_and_run()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+
+    # uvloop.install() is deprecated on Python 3.12+; uvloop.run() is the replacement
+    if uvloop is not None and sys.platform != "win32":
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
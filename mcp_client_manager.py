@@ -1,39 +1,121 @@
 import os
+import logging
 import re
-import json
+import time
+import asyncio
+import types
 import httpx
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Mapping, Optional, Sequence
+from collections import OrderedDict, defaultdict
 from contextlib import AsyncExitStack
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from mcp.client.sse import sse_client
 from mcp.client.streamable_http import streamable_http_client
+from mcp.types import CallToolResult, TextContent
+
+import json_utils
+
+logger = logging.getLogger(__name__)
+
+# On servers with "cache_tools": true in servers.json, tools with these name
+# prefixes are treated as read-only and their results cached
+CACHEABLE_TOOL_PREFIXES = ("search_", "get_", "extract_", "list_")
+
+# A server exposing this tool can run several of its own tool calls in one request
+BATCH_TOOL_NAME = "batch_execute"
+
+# Description length kept in the compact tool summaries
+TOOL_SUMMARY_LENGTH = 60
+
+_ENV_VAR_RE = re.compile(r"\${([^}]+)}")
+
+
+def _env_replace(match: re.Match) -> str:
+    """Resolve a ${VAR} match, leaving it untouched when VAR is unset."""
+    return os.getenv(match.group(1), match.group(0))
+
+
+def _freeze(entries: Sequence[dict]) -> tuple[Mapping, ...]:
+    """Return the entries as a tuple of read-only mappings."""
+    return tuple(types.MappingProxyType(entry) for entry in entries)
+
+
+def _arg_order(schema: dict) -> List[str]:
+    """Order a tool's properties for positional mapping: required ones first."""
+    required_props = schema.get("required", [])
+    return required_props + [
+        p for p in schema.get("properties", {}) if p not in required_props
+    ]
 
 
 class MCPClientManager:
-    def __init__(self, config_path: str = "servers.json"):
+    def __init__(
+        self,
+        config_path: str = "servers.json",
+        tool_cache_size: int = 512,
+        tool_cache_ttl: Optional[float] = None,
+        http_pool_size: int = 4,
+    ):
         self.config_path = config_path
         self.sessions: Dict[str, ClientSession] = {}
         self.tool_to_server: Dict[str, str] = {}
+        # Positional argument order for '@tool' shortcuts: required first, then the rest
+        self.tool_arg_order: Dict[str, List[str]] = {}
         self.resource_to_server: Dict[str, str] = {}
         self.resource_templates_to_server: Dict[str, str] = {}
         self.prompt_to_server: Dict[str, str] = {}
 
-        self.available_tools: List[dict] = []
-        self.available_resources: List[dict] = []
-        self.available_resource_templates: List[dict] = []
-        self.available_prompts: List[dict] = []
+        # Direct name -> session indexes for the hot dispatch paths
+        self.tool_to_session: Dict[str, ClientSession] = {}
+        self.resource_to_session: Dict[str, ClientSession] = {}
+        self.prompt_to_session: Dict[str, ClientSession] = {}
+        # (literal prefix, session) of each resource template, longest first
+        self._template_prefixes: List[tuple[str, ClientSession]] = []
+
+        # Frozen into a tuple once connect_all finishes registering tools
+        self.available_tools: Sequence[dict] = []
+        # Compact name + short description variants of available_tools, for
+        # two-phase tool selection; frozen alongside it
+        self.tool_summaries: Sequence[dict] = []
+        self._tool_definitions: Dict[str, dict] = {}
+        # Frozen into tuples of read-only mappings once connect_all finishes
+        self.available_resources: Sequence[Mapping] = []
+        self.available_resource_templates: Sequence[Mapping] = []
+        self.available_prompts: Sequence[Mapping] = []
+
+        # server name -> {"tools", "resources", "templates", "prompts"} -> names
+        self.capabilities_by_server: Dict[str, Dict[str, List[str]]] = defaultdict(
+            lambda: {"tools": [], "resources": [], "templates": [], "prompts": []}
+        )
+
+        # LRU of (tool_name, canonical args) -> (result, monotonic timestamp)
+        self._tool_cache: OrderedDict[tuple[str, str], tuple[Any, float]] = (
+            OrderedDict()
+        )
+        self._tool_cache_size = tool_cache_size
+        self._tool_cache_ttl = tool_cache_ttl
+        # Names of the read-only tools on servers that opted in to caching; live
+        # servers (e.g. GitHub) are never cached unless their config asks for it
+        self._cacheable_tools: set[str] = set()
+
+        # Extra sessions per HTTP server so concurrent tool calls use separate
+        # streams; stdio servers are a single serial pipe and keep one session
+        self._http_pool_size = http_pool_size
+        self._pools: Dict[str, asyncio.Queue[ClientSession]] = {}
+
+        self._server_tasks: List[asyncio.Task] = []
+        self._shutdown: Optional[asyncio.Event] = None
 
         self.server_configs: List[dict] = self._load_server_config()
 
     def _substitute_env_vars(self, obj: Any) -> Any:
         """Substitute environment variables in strings, lists, or dicts."""
         if isinstance(obj, str):
-
-            def replace(match):
-                return os.getenv(match.group(1), match.group(0))
-
-            return re.sub(r"\${([^}]+)}", replace, obj)
+            # Most config values reference no variables; skip the regex for them
+            if "$" not in obj:
+                return obj
+            return _ENV_VAR_RE.sub(_env_replace, obj)
         elif isinstance(obj, list):
             return [self._substitute_env_vars(item) for item in obj]
         elif isinstance(obj, dict):
@@ -43,141 +125,307 @@ class MCPClientManager:
     def _load_server_config(self) -> List[dict]:
         """Load server configuration from JSON and substitute environment variables."""
         try:
-            if not os.path.exists(self.config_path):
-                print(f"Warning: {self.config_path} not found.")
-                return []
-
-            with open(self.config_path, "r") as f:
-                config = json.load(f)
-                servers = config.get("servers", [])
-                return self._substitute_env_vars(servers)
-        except Exception as e:
-            print(f"Error loading config {self.config_path}: {e}")
+            with open(self.config_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            logger.warning("Warning: %s not found.", self.config_path)
+            return []
+        except OSError as e:
+            logger.error("Error reading config %s: %s", self.config_path, e)
+            return []
+
+        try:
+            config = json_utils.loads(data)
+        except (json_utils.JSONDecodeError, UnicodeDecodeError) as e:
+            logger.error("Invalid JSON in config %s: %s", self.config_path, e)
             return []
 
+        # Individual server entries are only checked when connect_all uses them
+        servers = config.get("servers", []) if isinstance(config, dict) else []
+        # No ${ in the raw bytes means nothing to substitute, unless it is hidden
+        # behind a \u escape, so skip walking the whole config
+        if b"${" not in data and b"\\u" not in data:
+            return servers
+        return self._substitute_env_vars(servers)
+
     async def connect_all(self, stack: AsyncExitStack):
-        """Connect to all configured servers and initialize sessions."""
+        """Connect to all configured servers concurrently and initialize sessions.
+
+        Each server is owned by its own task, because the MCP transports must be
+        closed from the task that opened them. Their shutdown is registered on
+        ``stack``, so leaving the caller's stack disconnects every server.
+        """
         if not self.server_configs:
             return
 
-        print(f"\n🔌 Connecting to {len(self.server_configs)} server(s)...")
+        logger.info("\n🔌 Connecting to %d server(s)...", len(self.server_configs))
+
+        loop = asyncio.get_running_loop()
+        self._shutdown = asyncio.Event()
+        stack.push_async_callback(self.aclose)
 
+        ready_futures = []
         for server in self.server_configs:
+            logger.info("\n  Connecting to '%s' server...", server["name"])
+            ready = loop.create_future()
+            self._server_tasks.append(
+                asyncio.create_task(self._run_server(server, ready))
+            )
+            ready_futures.append(ready)
+
+        results = await asyncio.gather(*ready_futures, return_exceptions=True)
+
+        # Register in config order so tool listings stay deterministic
+        for server, result in zip(self.server_configs, results):
             server_name = server["name"]
-            print(f"\n  Connecting to '{server_name}' server...")
+            if isinstance(result, BaseException):
+                logger.error(
+                    "    ❌ Failed to connect to '%s': %s", server_name, result
+                )
+                continue
 
-            try:
-                # 1. Determine transport and create client context
-                transport_type = server.get("transport", "stdio")
-
-                if transport_type == "sse":
-                    url = server.get("url")
-                    if not url:
-                        print(f"    ⚠️ Error: 'url' required for SSE in '{server_name}'")
-                        continue
-                    client_ctx = sse_client(url, headers=server.get("headers"))
-
-                elif transport_type == "http":
-                    url = server.get("url")
-                    if not url:
-                        print(
-                            f"    ⚠️ Error: 'url' required for HTTP in '{server_name}'"
-                        )
-                        continue
-                    # Create and manage httpx client for life of this connection
-                    http_client = httpx.AsyncClient(headers=server.get("headers"))
-                    await stack.enter_async_context(http_client)
-                    client_ctx = streamable_http_client(url, http_client=http_client)
-
-                else:  # Default stdio
-                    server_params = StdioServerParameters(
-                        command=server["command"],
-                        args=server["args"],
-                        env=server.get("env"),
-                    )
-                    client_ctx = stdio_client(server_params)
+            session, capabilities, pool_sessions = result
+            self.sessions[server_name] = session
+            if len(pool_sessions) > 1:
+                pool = asyncio.Queue()
+                for pooled in pool_sessions:
+                    pool.put_nowait(pooled)
+                self._pools[server_name] = pool
+            self._register_capabilities(server_name, session, *capabilities)
+            if server.get("cache_tools", False):
+                self._cacheable_tools.update(
+                    name
+                    for name in self.capabilities_by_server[server_name]["tools"]
+                    if name.startswith(CACHEABLE_TOOL_PREFIXES)
+                )
 
-                # 2. Enter client context
-                result = await stack.enter_async_context(client_ctx)
-                if isinstance(result, (list, tuple)) and len(result) == 3:
-                    read, write, _ = result
-                else:
-                    read, write = result
+        # Sent with every completion request; hand the LLM client the same
+        # immutable object each turn instead of a list it may copy
+        self.available_tools = tuple(self.available_tools)
+        self.tool_summaries = tuple(self.tool_summaries)
+        # Only read locally, so these can also be made read-only; tools stay plain
+        # dicts because the LLM client has to JSON-serialize them
+        self.available_resources = _freeze(self.available_resources)
+        self.available_resource_templates = _freeze(self.available_resource_templates)
+        self.available_prompts = _freeze(self.available_prompts)
 
-                # 3. Create and initialize session
-                session_ctx = ClientSession(read, write)
-                session = await stack.enter_async_context(session_ctx)
-                await session.initialize()
+        logger.info("\n✅ All servers connected!")
+        logger.info(
+            "   Total: %d tool(s), %d resource(s), %d template(s), %d prompt(s)",
+            len(self.available_tools),
+            len(self.available_resources),
+            len(self.available_resource_templates),
+            len(self.available_prompts),
+        )
 
-                self.sessions[server_name] = session
+    async def _run_server(self, server: dict, ready: asyncio.Future):
+        """Open one server connection and keep it alive until shutdown."""
+        try:
+            async with AsyncExitStack() as stack:
+                session = await self._open_session(server, stack)
+                # Discovery only sends requests, so it can overlap opening the pool
+                discovery = asyncio.ensure_future(self._discover_capabilities(session))
+                pool_sessions = await self._open_pool(server, stack, session)
+                capabilities = await discovery
+                ready.set_result((session, capabilities, pool_sessions))
+                await self._shutdown.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning(
+                    "    ⚠️ Connection to '%s' closed with error: %s", server["name"], e
+                )
+        finally:
+            if not ready.done():
+                ready.cancel()
 
-                # 4. Discover capabilities (Tools, Resources, etc.)
-                await self._discover_capabilities(server_name, session)
+    async def _open_pool(
+        self, server: dict, stack: AsyncExitStack, session: ClientSession
+    ) -> List[ClientSession]:
+        """Open extra sessions for an HTTP server; other transports get just one."""
+        pool_sessions = [session]
+        if server.get("transport", "stdio") != "http":
+            return pool_sessions
 
+        # Entered one at a time: the contexts must belong to this server's task
+        for _ in range(self._http_pool_size - 1):
+            try:
+                pool_sessions.append(await self._open_session(server, stack))
             except Exception as e:
-                print(f"    ❌ Failed to connect to '{server_name}': {e}")
+                logger.warning(
+                    "    ⚠️ Could not open extra session for '%s': %s", server["name"], e
+                )
+                break
+        return pool_sessions
+
+    async def aclose(self):
+        """Close every server connection concurrently.
+
+        Each server task unwinds its own exit stack, so teardown takes as long
+        as the slowest server. Safe to call more than once.
+        """
+        if self._shutdown is not None:
+            self._shutdown.set()
+        await asyncio.gather(*self._server_tasks, return_exceptions=True)
+        self._server_tasks.clear()
+
+        # Drop references to the closed sessions so nothing routes to them
+        self.sessions.clear()
+        self._pools.clear()
+        self.tool_to_session.clear()
+        self.resource_to_session.clear()
+        self.prompt_to_session.clear()
+        self._template_prefixes.clear()
+
+    async def _open_session(self, server: dict, stack: AsyncExitStack) -> ClientSession:
+        """Create the transport for a server and return an initialized session."""
+        server_name = server["name"]
+
+        # 1. Determine transport and create client context
+        transport_type = server.get("transport", "stdio")
+
+        if transport_type == "sse":
+            url = server.get("url")
+            if not url:
+                raise ValueError(f"'url' required for SSE in '{server_name}'")
+            client_ctx = sse_client(url, headers=server.get("headers"))
+
+        elif transport_type == "http":
+            url = server.get("url")
+            if not url:
+                raise ValueError(f"'url' required for HTTP in '{server_name}'")
+            # Create and manage httpx client for life of this connection
+            http_client = httpx.AsyncClient(headers=server.get("headers"))
+            await stack.enter_async_context(http_client)
+            client_ctx = streamable_http_client(url, http_client=http_client)
+
+        else:  # Default stdio
+            server_params = StdioServerParameters(
+                command=server["command"],
+                args=server["args"],
+                env=server.get("env"),
+            )
+            client_ctx = stdio_client(server_params)
 
-        print("\n✅ All servers connected!")
-        print(
-            f"   Total: {len(self.available_tools)} tool(s), {len(self.available_resources)} resource(s), {len(self.available_resource_templates)} template(s), {len(self.available_prompts)} prompt(s)"
+        # 2. Enter client context
+        result = await stack.enter_async_context(client_ctx)
+        if isinstance(result, (list, tuple)) and len(result) == 3:
+            read, write, _ = result
+        else:
+            read, write = result
+
+        # 3. Create and initialize session
+        session_ctx = ClientSession(read, write)
+        session = await stack.enter_async_context(session_ctx)
+        await session.initialize()
+        return session
+
+    async def _discover_capabilities(self, session: ClientSession) -> tuple:
+        """Fetch tools, resources, templates, and prompts from a session concurrently.
+
+        Only a failure to list tools is fatal; the other listings are optional
+        and come back as ``None`` when the server does not support them.
+        """
+        responses = await asyncio.gather(
+            session.list_tools(),
+            session.list_resources(),
+            session.list_resource_templates(),
+            session.list_prompts(),
+            return_exceptions=True,
+        )
+        if isinstance(responses[0], BaseException):
+            raise responses[0]
+        return tuple(
+            None if isinstance(response, BaseException) else response
+            for response in responses
         )
 
-    async def _discover_capabilities(self, server_name: str, session: ClientSession):
-        """List and register tools, resources, templates, and prompts from a session."""
+    def _register_capabilities(
+        self,
+        server_name: str,
+        session: ClientSession,
+        tools_response: Any,
+        res_response: Any,
+        tmpl_response: Any,
+        prompt_response: Any,
+    ):
+        """Register the discovered tools, resources, templates, and prompts."""
+        bucket = self.capabilities_by_server[server_name]
 
         # Tools
-        tools_response = await session.list_tools()
         tools = tools_response.tools
+        tool_to_server = self.tool_to_server
+        tool_to_session = self.tool_to_session
+        tool_arg_order = self.tool_arg_order
+        available_tools = self.available_tools
+        tool_summaries = self.tool_summaries
+        tool_definitions = self._tool_definitions
+        tool_names = bucket["tools"]
         for tool in tools:
-            self.tool_to_server[tool.name] = server_name
-            self.available_tools.append(
+            tool_to_server[tool.name] = server_name
+            tool_to_session[tool.name] = session
+            tool_arg_order[tool.name] = _arg_order(tool.inputSchema)
+            tool_names.append(tool.name)
+            definition = {
+                "type": "function",
+                "function": {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "parameters": tool.inputSchema,
+                },
+            }
+            available_tools.append(definition)
+            tool_definitions[tool.name] = definition
+            tool_summaries.append(
                 {
                     "type": "function",
                     "function": {
                         "name": tool.name,
-                        "description": tool.description,
-                        "parameters": tool.inputSchema,
+                        "description": (tool.description or "")[:TOOL_SUMMARY_LENGTH],
+                        "parameters": {"type": "object", "properties": {}},
                     },
                 }
             )
 
         # Resources
-        try:
-            res_response = await session.list_resources()
+        if res_response is not None:
             for res in res_response.resources:
-                self.resource_to_server[str(res.uri)] = server_name
+                uri = str(res.uri)
+                self.resource_to_server[uri] = server_name
+                self.resource_to_session[uri] = session
+                bucket["resources"].append(uri)
                 self.available_resources.append(
                     {
-                        "uri": str(res.uri),
+                        "uri": uri,
                         "name": res.name,
                         "description": res.description,
                         "mimeType": res.mimeType,
                     }
                 )
-        except Exception:
-            pass
 
         # Resource Templates
-        try:
-            tmpl_response = await session.list_resource_templates()
+        if tmpl_response is not None:
             for tmpl in tmpl_response.resourceTemplates:
-                self.resource_templates_to_server[str(tmpl.uriTemplate)] = server_name
+                uri_template = str(tmpl.uriTemplate)
+                self.resource_templates_to_server[uri_template] = server_name
+                self._template_prefixes.append((uri_template.split("{")[0], session))
+                bucket["templates"].append(uri_template)
                 self.available_resource_templates.append(
                     {
-                        "uriTemplate": str(tmpl.uriTemplate),
+                        "uriTemplate": uri_template,
                         "name": tmpl.name,
                         "description": tmpl.description,
                         "mimeType": tmpl.mimeType,
                     }
                 )
-        except Exception:
-            pass
 
         # Prompts
-        try:
-            prompt_response = await session.list_prompts()
+        if prompt_response is not None:
             for prompt in prompt_response.prompts:
                 self.prompt_to_server[prompt.name] = server_name
+                self.prompt_to_session[prompt.name] = session
+                bucket["prompts"].append(prompt.name)
                 self.available_prompts.append(
                     {
                         "name": prompt.name,
@@ -187,23 +435,197 @@ class MCPClientManager:
                         else [],
                     }
                 )
-        except Exception:
-            pass
 
-        print(f"    ✓ Connected: {len(tools)} tool(s)")
+        self._template_prefixes.sort(key=lambda entry: -len(entry[0]))
+
+        logger.info("    ✓ Connected '%s': %d tool(s)", server_name, len(tools))
 
     async def call_tool(self, tool_name: str, arguments: dict) -> Any:
-        """Route tool call to the correct server session."""
-        server_name = self.tool_to_server.get(tool_name)
-        if not server_name:
+        """Route tool call to the correct server session.
+
+        Results of read-only tools (see ``CACHEABLE_TOOL_PREFIXES``) on servers
+        configured with ``"cache_tools": true`` are served from an in-process LRU
+        cache when the same arguments were seen before.
+        """
+        session = self.tool_to_session.get(tool_name)
+        if not session:
             raise ValueError(f"Tool {tool_name} not found in any connected server")
 
-        session = self.sessions[server_name]
-        return await session.call_tool(tool_name, arguments)
+        cache_key, cached = self._cache_get(tool_name, arguments)
+        if cached is not None:
+            return cached
+
+        result = await self._send(
+            self.tool_to_server[tool_name], session, tool_name, arguments
+        )
+        if cache_key is not None and not result.isError:
+            self._cache_put(cache_key, result)
+        return result
+
+    def _cache_get(self, tool_name: str, arguments: dict) -> tuple[Any, Any]:
+        """Return ``(cache key, cached result)``; the key is None if not cacheable."""
+        if tool_name not in self._cacheable_tools:
+            return None, None
+        cache_key = (tool_name, json_utils.dumps(arguments, sort_keys=True))
+        cached = self._tool_cache.get(cache_key)
+        if cached is None:
+            return cache_key, None
+        result, stored_at = cached
+        if (
+            self._tool_cache_ttl is None
+            or time.monotonic() - stored_at < self._tool_cache_ttl
+        ):
+            self._tool_cache.move_to_end(cache_key)
+            return cache_key, result
+        del self._tool_cache[cache_key]
+        return cache_key, None
+
+    def _cache_put(self, cache_key: tuple, result: Any):
+        """Store a successful result, evicting the least recently used entry."""
+        self._tool_cache[cache_key] = (result, time.monotonic())
+        if len(self._tool_cache) > self._tool_cache_size:
+            self._tool_cache.popitem(last=False)
+
+    async def _send(
+        self,
+        server_name: str,
+        session: ClientSession,
+        tool_name: str,
+        arguments: dict,
+    ) -> Any:
+        """Call a tool on a server, borrowing a pooled session when it has a pool."""
+        pool = self._pools.get(server_name) if self._pools else None
+        if pool is None:
+            return await session.call_tool(tool_name, arguments)
+        pooled = await pool.get()
+        try:
+            return await pooled.call_tool(tool_name, arguments)
+        finally:
+            pool.put_nowait(pooled)
+
+    async def call_tools_batch(self, calls: Sequence[tuple[str, dict]]) -> List[Any]:
+        """Run several tool calls, using one round-trip per server where possible.
+
+        Cache misses for two or more calls aimed at the same server, when that
+        server exposes ``batch_execute``, go to it as a single request; everything
+        else goes through ``call_tool`` concurrently. Results come back in call
+        order, with the exception in place of any call that failed.
+        """
+        results: List[Any] = [None] * len(calls)
+        capabilities = self.capabilities_by_server
+        # server -> [(call index, cache key)] of calls it could run in one batch
+        grouped: Dict[str, List[tuple[int, Any]]] = defaultdict(list)
+        direct: List[int] = []
+        for i, (tool_name, arguments) in enumerate(calls):
+            server_name = self.tool_to_server.get(tool_name)
+            if (
+                server_name is None
+                or tool_name == BATCH_TOOL_NAME
+                or BATCH_TOOL_NAME not in capabilities[server_name]["tools"]
+            ):
+                direct.append(i)
+                continue
+            cache_key, cached = self._cache_get(tool_name, arguments)
+            if cached is not None:
+                results[i] = cached
+            else:
+                grouped[server_name].append((i, cache_key))
+
+        batches = {}
+        for server_name, entries in grouped.items():
+            if len(entries) > 1:
+                batches[server_name] = entries
+            else:
+                direct.append(entries[0][0])
+
+        outcomes = await asyncio.gather(
+            *(self.call_tool(*calls[i]) for i in direct),
+            *(
+                self._call_batch(server_name, [calls[i] for i, _ in entries])
+                for server_name, entries in batches.items()
+            ),
+            return_exceptions=True,
+        )
+
+        for i, outcome in zip(direct, outcomes):
+            results[i] = outcome
+        for entries, outcome in zip(batches.values(), outcomes[len(direct) :]):
+            if isinstance(outcome, BaseException):
+                for i, _ in entries:
+                    results[i] = outcome
+                continue
+            for (i, cache_key), result in zip(entries, outcome):
+                results[i] = result
+                if cache_key is not None and not result.isError:
+                    self._cache_put(cache_key, result)
+        return results
+
+    async def _call_batch(
+        self, server_name: str, calls: Sequence[tuple[str, dict]]
+    ) -> List[CallToolResult]:
+        """Send calls to a server's ``batch_execute`` tool and split its reply.
+
+        The tool takes ``{"calls": [{"name", "arguments"}, ...]}`` and answers with
+        a JSON list holding one ``{"content", "isError"}`` object per sub-call, in
+        order. ``content`` is the sub-call's text, or any JSON value.
+        """
+        result = await self._send(
+            server_name,
+            self.sessions[server_name],
+            BATCH_TOOL_NAME,
+            {"calls": [{"name": name, "arguments": args} for name, args in calls]},
+        )
+        text = result.content[0].text if result.content else ""
+        if result.isError:
+            raise RuntimeError(text or f"{BATCH_TOOL_NAME} failed on {server_name}")
+        items = json_utils.loads(text)
+        if (
+            not isinstance(items, list)
+            or len(items) != len(calls)
+            or not all(isinstance(item, dict) and "content" in item for item in items)
+        ):
+            raise ValueError(
+                f"{BATCH_TOOL_NAME} on {server_name} returned a malformed reply"
+            )
+        return [
+            CallToolResult(
+                content=[
+                    TextContent(
+                        type="text",
+                        text=item["content"]
+                        if isinstance(item["content"], str)
+                        else json_utils.dumps(item["content"]),
+                    )
+                ],
+                isError=bool(item.get("isError", False)),
+            )
+            for item in items
+        ]
 
     def get_tool_schema(self, tool_name: str) -> Optional[dict]:
         """Get the input schema for a specific tool."""
-        for tool in self.available_tools:
-            if tool["function"]["name"] == tool_name:
-                return tool["function"]["parameters"]
-        return None
+        definition = self._tool_definitions.get(tool_name)
+        return definition["function"]["parameters"] if definition else None
+
+    def get_tool_definitions(self, tool_names: Iterable[str]) -> List[dict]:
+        """Return the full definitions of the named tools, skipping unknown names."""
+        definitions = self._tool_definitions
+        return [
+            definitions[name]
+            for name in dict.fromkeys(tool_names)
+            if name in definitions
+        ]
+
+    def get_resource_session(self, resource_uri: str) -> Optional[ClientSession]:
+        """Find the session serving a URI, falling back to the longest template match."""
+        session = self.resource_to_session.get(resource_uri)
+        if session:
+            return session
+        return next(
+            (
+                srv_session
+                for prefix, srv_session in self._template_prefixes
+                if resource_uri.startswith(prefix)
+            ),
+            None,
+        )